@@ -36,30 +36,115 @@ DEFAULT_EXCLUDES: set[Path] = {
 }
 
 
-_DECLARATION_RE = re.compile(
-    r"^\s*(?:public|internal|fileprivate|private)?\s*"
-    r"(?:final\s+)?(?:static\s+|class\s+)?"
-    r"(struct|enum|class|protocol|typealias|extension|func|init|subscript|let|var)\b"
+# How far above a declaration's preceding line to look for the start of a multi-line attribute
+# (for example an `@available(...)` block whose continuation lines don't start with `@`).
+_ATTRIBUTE_LOOKBACK_LIMIT = 20
+
+# Line boundaries `str.splitlines()` recognises beyond `\n` / `\r` / `\r\n` (which
+# `bytes.splitlines()` already handles), as UTF-8 byte sequences.
+_EXTRA_LINE_BREAKS = (
+    b"\x0b",
+    b"\x0c",
+    b"\x1c",
+    b"\x1d",
+    b"\x1e",
+    b"\xc2\x85",
+    b"\xe2\x80\xa8",
+    b"\xe2\x80\xa9",
 )
 
-_TYPE_RE = re.compile(
-    r"^\s*(?:public|internal|fileprivate|private)?\s*(?:final\s+)?"
-    r"(struct|enum|class|protocol|extension)\b"
+
+# Anchored at the first token, so `import`, `case` and `//` lines can never match. Every line
+# `_LINE_RE` classifies as `type` / `func` / `prop` also matches this pattern.
+_DECLARATION_RE = re.compile(
+    rb"^\s*(?:public|internal|fileprivate|private)?\s*"
+    rb"(?:final\s+)?(?:static\s+|class\s+)?"
+    rb"(struct|enum|class|protocol|typealias|extension|func|init|subscript|let|var)\b"
 )
 
-_FUNC_RE = re.compile(
-    r"^\s*(?:public|internal|fileprivate|private)?\s*(?:static\s+|class\s+)?(func|init|subscript)\b"
+# Sorts a declaration line (one `_DECLARATION_RE` matched) into `type` / `func` / `prop` for
+# context detection; dispatch on `match.lastgroup`. Branches are tried in order, so `type` wins
+# over `func` and `func` wins over `prop`. The access modifier prefix is shared by all branches.
+_LINE_RE = re.compile(
+    rb"^\s*(?:public|internal|fileprivate|private)?\s*(?:"
+    rb"(?:final\s+)?(?P<type>struct|enum|class|protocol|extension)\b"
+    rb"|(?:static\s+|class\s+)?(?:"
+    rb"(?P<func>func|init|subscript)\b"
+    rb"|(?P<prop>let|var)\b.*\{\s*$"
+    rb"))"
 )
 
-_COMPUTED_PROPERTY_RE = re.compile(
-    r"^\s*(?:public|internal|fileprivate|private)?\s*(?:static\s+|class\s+)?(let|var)\b.*\{\s*$"
+_CLOSURE_START_RE = re.compile(rb"=.*\{\s*$")
+
+# The only attribute matcher: decides whether an `@` line is skipped for context detection.
+_ATTRIBUTE_RE = re.compile(rb"^\s*@\w+")
+
+# Every regex in this module needs at least one of these substrings to match, so lines without
+# any of them skip the regex work entirely. Braces are included so skipped lines never change
+# the brace depth.
+_FAST_KEYWORDS = (
+    b"func",
+    b"var",
+    b"let",
+    b"struct",
+    b"enum",
+    b"class",
+    b"protocol",
+    b"extension",
+    b"init",
+    b"subscript",
+    b"typealias",
+    b"///",
+    b"/**",
+    b"@",
+    b"{",
+    b"}",
 )
 
-_CLOSURE_START_RE = re.compile(r"=.*\{\s*$")
+_FAST_KEYWORDS_RE = re.compile(b"|".join(re.escape(keyword) for keyword in _FAST_KEYWORDS))
 
-_DOC_RE = re.compile(r"^\s*(///|/\*\*)")
 
-_ATTRIBUTE_RE = re.compile(r"^\s*@\w+")
+@dataclass(frozen=True)
+class _Syntax:
+    """The patterns and literals `_scan_file` matches a line against, in one string type."""
+
+    keywords: re.Pattern
+    declaration: re.Pattern
+    line: re.Pattern
+    closure_start: re.Pattern
+    attribute: re.Pattern
+    doc_prefixes: tuple
+    at: bytes | str
+    open_brace: bytes | str
+    close_brace: bytes | str
+
+
+# Used for ASCII lines, i.e. nearly all of them.
+_BYTES_SYNTAX = _Syntax(
+    keywords=_FAST_KEYWORDS_RE,
+    declaration=_DECLARATION_RE,
+    line=_LINE_RE,
+    closure_start=_CLOSURE_START_RE,
+    attribute=_ATTRIBUTE_RE,
+    doc_prefixes=(b"///", b"/**"),
+    at=b"@",
+    open_brace=b"{",
+    close_brace=b"}",
+)
+
+# Used for decoded non-ASCII lines, where bytes patterns would narrow `\s`, `\w`, `\b` and
+# `strip()` to ASCII (for example U+00A0 and U+3000 must still count as whitespace).
+_TEXT_SYNTAX = _Syntax(
+    keywords=re.compile(_FAST_KEYWORDS_RE.pattern.decode("ascii")),
+    declaration=re.compile(_DECLARATION_RE.pattern.decode("ascii")),
+    line=re.compile(_LINE_RE.pattern.decode("ascii")),
+    closure_start=re.compile(_CLOSURE_START_RE.pattern.decode("ascii")),
+    attribute=re.compile(_ATTRIBUTE_RE.pattern.decode("ascii")),
+    doc_prefixes=("///", "/**"),
+    at="@",
+    open_brace="{",
+    close_brace="}",
+)
 
 
 @dataclass(frozen=True)
@@ -69,66 +154,19 @@ class Finding:
     declaration: str
 
 
-def _count_braces(line: str) -> tuple[int, int]:
-    # Note: This is intentionally simple (doesn't attempt to ignore strings/comments).
-    return line.count("{"), line.count("}")
-
-
-def _is_doc_line(line: str) -> bool:
-    return _DOC_RE.match(line) is not None
-
-
-def _is_attribute_line(line: str) -> bool:
-    return _ATTRIBUTE_RE.match(line) is not None
-
-
-def _prev_doc_line(lines: list[str], index: int) -> str | None:
-    j = index - 1
-    while j >= 0:
-        previous = lines[j]
-        if not previous.strip():
-            j -= 1
-            continue
-        if _is_attribute_line(previous):
-            j -= 1
-            continue
-
-        # Support multi-line attributes (for example `@available(...)` blocks) where the lines
-        # between the attribute and the declaration don't start with `@`.
-        lookback_limit = 20
-        k = j
-        while k >= 0 and (j - k) <= lookback_limit:
-            candidate = lines[k].strip()
-            if not candidate:
-                break
-            if _is_doc_line(lines[k]):
-                break
-            if candidate.startswith("@"):
-                j = k - 1
-                previous = ""
-                break
-            k -= 1
-        if previous == "":
-            continue
-        return previous
-    return None
-
-
-def _is_declaration_line(line: str) -> bool:
-    stripped = line.strip()
-    if not stripped:
-        return False
-    if stripped.startswith("import "):
-        return False
-    if stripped.startswith("//"):
-        return False
-    if stripped.startswith("case "):
-        return False
-    return _DECLARATION_RE.match(line) is not None
+def _read_lines(file_path: Path) -> list[bytes]:
+    # Lines stay undecoded; `_scan_file` decodes only the non-ASCII ones.
+    data = file_path.read_bytes()
+    if any(separator in data for separator in _EXTRA_LINE_BREAKS):
+        # Rare: split like `str.splitlines()` while round-tripping the original bytes.
+        return [
+            line.encode("utf-8", errors="surrogateescape")
+            for line in data.decode("utf-8", errors="surrogateescape").splitlines()
+        ]
+    return data.splitlines()
 
 
 def _scan_file(file_path: Path) -> list[Finding]:
-    lines = file_path.read_text(encoding="utf-8").splitlines()
     findings: list[Finding] = []
 
     brace_depth = 0
@@ -136,34 +174,91 @@ def _scan_file(file_path: Path) -> list[Finding]:
     pending_context: str | None = None  # "type" | "code"
     pending_depth: int | None = None
 
-    for i, line in enumerate(lines):
+    # Doc lookup state, maintained in a single forward pass. `prev_is_doc` answers "is the
+    # closest preceding line that isn't blank or part of an attribute a doc comment?" for the
+    # line about to be processed. Attribute lines are skipped; so are up to
+    # `_ATTRIBUTE_LOOKBACK_LIMIT` continuation lines after the last `@` line of a contiguous
+    # (non-blank, non-doc) block, in which case the answer is the one recorded before that `@`.
+    prev_is_doc = False
+    attribute_line = -1
+    prev_is_doc_before_attribute = False
+
+    for i, raw_line in enumerate(_read_lines(file_path)):
+        if raw_line.isascii():
+            line = raw_line
+            syntax = _BYTES_SYNTAX
+        else:
+            line = raw_line.decode("utf-8", errors="replace")
+            syntax = _TEXT_SYNTAX
         stripped = line.strip()
 
-        # Check docs for declarations that are not inside a code block (function/closure body).
-        if not code_stack and _is_declaration_line(line):
-            previous = _prev_doc_line(lines, i)
-            if previous is None or not _is_doc_line(previous):
-                findings.append(Finding(file=file_path, line=i + 1, declaration=line.rstrip()))
+        if not syntax.keywords.search(line):
+            # Blank or plain code line: only the doc lookup state can change.
+            if not stripped:
+                attribute_line = -1
+            elif attribute_line >= 0 and i - attribute_line <= _ATTRIBUTE_LOOKBACK_LIMIT:
+                prev_is_doc = prev_is_doc_before_attribute
+            else:
+                prev_is_doc = False
+            continue
+
+        # Classify the line once; both the doc lookup state and context detection reuse it.
+        is_doc = stripped.startswith(syntax.doc_prefixes)
+        starts_with_at = stripped.startswith(syntax.at)
 
-        # Skip doc/attribute lines for context detection.
+        # Check docs for declarations that are not inside a code block (function/closure body).
+        is_declaration = not code_stack and syntax.declaration.match(line) is not None
+        if is_declaration and not prev_is_doc:
+            findings.append(
+                Finding(
+                    file=file_path,
+                    line=i + 1,
+                    declaration=raw_line.decode("utf-8", errors="replace").rstrip(),
+                )
+            )
+
+        if is_doc:
+            attribute_line = -1
+            prev_is_doc = True
+        elif starts_with_at:
+            attribute_line = i
+            prev_is_doc_before_attribute = prev_is_doc
+        elif attribute_line >= 0 and i - attribute_line <= _ATTRIBUTE_LOOKBACK_LIMIT:
+            prev_is_doc = prev_is_doc_before_attribute
+        else:
+            prev_is_doc = False
+
+        # Skip doc/attribute lines for context detection. Only declaration lines can classify as
+        # `type` / `func` / `prop`, so the classifier regex runs on those alone.
         #
         # Note: We don't try to track nested code blocks while already inside a code block because
         # we don't report missing docs there.
-        if not code_stack and stripped and not stripped.startswith(("///", "/**")) and not _is_attribute_line(line):
-            if _TYPE_RE.match(line):
+        if not code_stack:
+            if is_declaration:
+                match = syntax.line.match(line)
+                kind = match.lastgroup if match else None
+            elif is_doc or (starts_with_at and syntax.attribute.match(line)):
+                kind = "skip"
+            else:
+                kind = None
+
+            if kind == "type":
                 pending_context = "type"
                 pending_depth = brace_depth
-            elif _FUNC_RE.match(line):
-                pending_context = "code"
-                pending_depth = brace_depth
-            elif _COMPUTED_PROPERTY_RE.match(line):
+            elif kind in ("func", "prop"):
                 pending_context = "code"
                 pending_depth = brace_depth
-            elif _CLOSURE_START_RE.search(line) and stripped.endswith("{"):
+            elif (
+                kind is None
+                and stripped.endswith(syntax.open_brace)
+                and syntax.closure_start.search(line)
+            ):
                 pending_context = "code"
                 pending_depth = brace_depth
 
-        opens, closes = _count_braces(line)
+        # Note: This is intentionally simple (doesn't attempt to ignore strings/comments).
+        opens = line.count(syntax.open_brace)
+        closes = line.count(syntax.close_brace)
 
         # If a pending context exists and we see an opening brace at the same depth, assume the
         # first `{` starts that context.
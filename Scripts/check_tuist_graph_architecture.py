@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import subprocess
 import sys
 import tempfile
 import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -19,12 +21,6 @@ _MODULE_KINDS = {"interface", "impl", "testing", "tests"}
 _MODULE_LAYERS = {"core", "compositionRoot", "feature", "shared", "utility", "app"}
 
 
-@dataclass(frozen=True)
-class _TargetKey:
-    project_path: str
-    target_name: str
-
-
 @dataclass(frozen=True)
 class _ModuleTarget:
     layer: str
@@ -33,6 +29,18 @@ class _ModuleTarget:
     bundle_id: str
 
 
+@dataclass(frozen=True)
+class _TargetGraph:
+    # Targets are addressed by dense integer ids into parallel lists. Targets without a module
+    # bundle ID (or only seen as a dependency) have empty `kinds` / `layers` / `bundle_ids`.
+    project_paths: list[str]
+    target_names: list[str]
+    kinds: list[str]
+    layers: list[str]
+    bundle_ids: list[str]
+    edges: list[tuple[int, int]]
+
+
 def _safe_print(message: str, *, file=sys.stdout) -> None:
     try:
         print(message, file=file, flush=True)
@@ -40,7 +48,11 @@ def _safe_print(message: str, *, file=sys.stdout) -> None:
         raise SystemExit(0)
 
 
-def _run_tuist_graph_json(output_dir: Path) -> Path:
+def _run_tuist_graph_json(output_dir: Path) -> bytes:
+    # `tuist graph` can only write `graph.json` into `--output-path`; there is no stdout mode to
+    # capture, so parsing can't be pipelined with the run (and the stdlib loader isn't
+    # incremental anyway). Scanning the graph takes milliseconds next to tuist's own runtime.
+    # Hand back the raw bytes so they go straight to the JSON loader.
     cmd = [
         "tuist",
         "graph",
@@ -54,9 +66,10 @@ def _run_tuist_graph_json(output_dir: Path) -> Path:
     graph_path = output_dir / "graph.json"
     if not graph_path.exists():
         raise RuntimeError(f"Expected graph output at {graph_path}")
-    return graph_path
+    return graph_path.read_bytes()
 
 
+@functools.lru_cache(maxsize=None)
 def _parse_module_target(bundle_id: str) -> _ModuleTarget | None:
     parts = [p for p in bundle_id.split(".") if p]
     if len(parts) < 2:
@@ -83,114 +96,130 @@ def _parse_module_target(bundle_id: str) -> _ModuleTarget | None:
     return _ModuleTarget(layer=layer, module_name=module_name, kind=kind, bundle_id=bundle_id)
 
 
-def _iter_project_objects(graph: dict) -> list[dict]:
-    projects: list[dict] = []
+def _iter_project_objects(graph: dict) -> Iterator[dict]:
     for item in graph.get("projects", []):
         if isinstance(item, dict) and "path" in item and "targets" in item:
-            projects.append(item)
-    return projects
-
-
-def _load_graph(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _build_target_index(graph: dict) -> dict[_TargetKey, _ModuleTarget | None]:
-    index: dict[_TargetKey, _ModuleTarget | None] = {}
+            yield item
+
+
+def _load_graph(data: bytes) -> dict:
+    return json.loads(data)
+
+
+def _scan_graph(graph: dict) -> _TargetGraph:
+    id_of: dict[tuple[str, str], int] = {}
+    project_paths: list[str] = []
+    target_names: list[str] = []
+    kinds: list[str] = []
+    layers: list[str] = []
+    bundle_ids: list[str] = []
+    edges: list[tuple[int, int]] = []
+
+    def target_id(project_path: str, target_name: str) -> int:
+        key = (project_path, target_name)
+        existing = id_of.get(key)
+        if existing is not None:
+            return existing
+        new_id = len(project_paths)
+        id_of[key] = new_id
+        project_paths.append(project_path)
+        target_names.append(target_name)
+        kinds.append("")
+        layers.append("")
+        bundle_ids.append("")
+        return new_id
+
+    # Malformed dependency containers are caught per entry by the `try`/`except` below, so only
+    # that entry is skipped and the target's remaining edges are still collected. Target names
+    # are still checked to be `str`.
     for project in _iter_project_objects(graph):
-        project_path = str(project.get("path"))
-        targets = project.get("targets", {})
-        if not isinstance(targets, dict):
+        project_path = str(project["path"])
+        try:
+            target_items = project["targets"].items()
+        except AttributeError:
             continue
-        for target_name, target in targets.items():
+
+        for source_target_name, target in target_items:
             if not isinstance(target, dict):
                 continue
+
+            source_id = target_id(project_path, source_target_name)
             bundle_id = target.get("bundleId")
             module_target = (
                 _parse_module_target(bundle_id) if isinstance(bundle_id, str) else None
             )
-            index[_TargetKey(project_path=project_path, target_name=target_name)] = module_target
-    return index
-
-
-def _iter_edges(graph: dict) -> list[tuple[_TargetKey, _TargetKey]]:
-    edges: list[tuple[_TargetKey, _TargetKey]] = []
-    for project in _iter_project_objects(graph):
-        project_path = str(project.get("path"))
-        targets = project.get("targets", {})
-        if not isinstance(targets, dict):
-            continue
-
-        for source_target_name, target in targets.items():
-            if not isinstance(target, dict):
-                continue
+            if module_target is None:
+                kinds[source_id] = layers[source_id] = bundle_ids[source_id] = ""
+            else:
+                kinds[source_id] = module_target.kind
+                layers[source_id] = module_target.layer
+                bundle_ids[source_id] = module_target.bundle_id
 
-            source_key = _TargetKey(
-                project_path=project_path, target_name=source_target_name
-            )
             dependencies = target.get("dependencies", [])
             if not isinstance(dependencies, list):
                 continue
 
             for dep in dependencies:
-                if not isinstance(dep, dict):
-                    continue
-
-                if "project" in dep and isinstance(dep["project"], dict):
-                    destination_project_path = str(dep["project"].get("path", ""))
-                    destination_target = dep["project"].get("target")
-                    if not destination_project_path or not isinstance(
-                        destination_target, str
-                    ):
+                try:
+                    if "project" in dep:
+                        project_dep = dep["project"]
+                        destination_project_path = str(project_dep.get("path", ""))
+                        destination_target = project_dep.get("target")
+                        if not destination_project_path or not isinstance(
+                            destination_target, str
+                        ):
+                            continue
+                        edges.append(
+                            (source_id, target_id(destination_project_path, destination_target))
+                        )
                         continue
-                    dest_key = _TargetKey(
-                        project_path=destination_project_path,
-                        target_name=destination_target,
-                    )
-                    edges.append((source_key, dest_key))
-                    continue
 
-                if "target" in dep and isinstance(dep["target"], dict):
-                    destination_target = dep["target"].get("name")
-                    if not isinstance(destination_target, str):
+                    if "target" in dep:
+                        destination_target = dep["target"].get("name")
+                        if not isinstance(destination_target, str):
+                            continue
+                        edges.append((source_id, target_id(project_path, destination_target)))
                         continue
-                    dest_key = _TargetKey(
-                        project_path=project_path, target_name=destination_target
-                    )
-                    edges.append((source_key, dest_key))
+                except (AttributeError, TypeError):
                     continue
 
-    return edges
+    return _TargetGraph(
+        project_paths=project_paths,
+        target_names=target_names,
+        kinds=kinds,
+        layers=layers,
+        bundle_ids=bundle_ids,
+        edges=edges,
+    )
 
 
-def _check_no_illegal_impl_to_impl_edges(
-    target_index: dict[_TargetKey, _ModuleTarget | None],
-    edges: list[tuple[_TargetKey, _TargetKey]],
-) -> list[str]:
+def _check_no_illegal_impl_to_impl_edges(target_graph: _TargetGraph) -> list[str]:
     violations: list[str] = []
+    project_paths = target_graph.project_paths
+    target_names = target_graph.target_names
+    kinds = target_graph.kinds
+    layers = target_graph.layers
+    bundle_ids = target_graph.bundle_ids
+
+    # Evaluate the per-target parts of the rule once per target instead of once per edge, then
+    # filter edges with flag lookups; messages are only built for the offending edges.
+    is_impl = [kind == "impl" for kind in kinds]
+    is_restricted_impl = [
+        impl and layer != "compositionRoot" for impl, layer in zip(is_impl, layers)
+    ]
+    offending_edges = [
+        (source_id, dest_id)
+        for source_id, dest_id in target_graph.edges
+        if is_restricted_impl[source_id] and is_impl[dest_id] and source_id != dest_id
+    ]
 
-    for source, dest in edges:
-        source_module = target_index.get(source)
-        dest_module = target_index.get(dest)
-
-        if source_module is None or dest_module is None:
-            continue
-
-        if source_module.kind != "impl" or dest_module.kind != "impl":
-            continue
-
-        if source.project_path == dest.project_path and source.target_name == dest.target_name:
-            continue
-
-        if source_module.layer == "compositionRoot":
-            continue
-
+    for source_id, dest_id in offending_edges:
         violations.append(
             "🛑 ARCHITECTURE VIOLATION 🛑\n"
             "---------------------------------------------------\n"
             f"Rule: Non-composition-root Impl targets must not link other Impl targets.\n"
-            f"From: {source.project_path} :: {source.target_name} ({source_module.bundle_id})\n"
-            f"To:   {dest.project_path} :: {dest.target_name} ({dest_module.bundle_id})\n"
+            f"From: {project_paths[source_id]} :: {target_names[source_id]} ({bundle_ids[source_id]})\n"
+            f"To:   {project_paths[dest_id]} :: {target_names[dest_id]} ({bundle_ids[dest_id]})\n"
             "Fix:\n"
             "- Depend on the other module's Interface target instead, or\n"
             "- Move wiring into a CompositionRoot.\n"
@@ -214,17 +243,14 @@ def main() -> int:
     start = time.perf_counter()
 
     if args.graph:
-        graph_path = args.graph
+        graph = _load_graph(args.graph.read_bytes())
     else:
         with tempfile.TemporaryDirectory(prefix="tuist-graph.") as tmp_dir:
-            graph_path = _run_tuist_graph_json(Path(tmp_dir))
-            graph = _load_graph(graph_path)
-    if args.graph:
-        graph = _load_graph(graph_path)
+            graph_data = _run_tuist_graph_json(Path(tmp_dir))
+        graph = _load_graph(graph_data)
 
-    target_index = _build_target_index(graph)
-    edges = _iter_edges(graph)
-    violations = _check_no_illegal_impl_to_impl_edges(target_index, edges)
+    target_graph = _scan_graph(graph)
+    violations = _check_no_illegal_impl_to_impl_edges(target_graph)
 
     duration_ms = int((time.perf_counter() - start) * 1000)
 
@@ -233,7 +259,7 @@ def main() -> int:
         _safe_print(f"❌ graph check failed ({len(violations)} violations, {duration_ms}ms).", file=sys.stderr)
         return 1
 
-    _safe_print(f"✅ graph check passed ({len(edges)} edges, {duration_ms}ms).")
+    _safe_print(f"✅ graph check passed ({len(target_graph.edges)} edges, {duration_ms}ms).")
     return 0
 
 
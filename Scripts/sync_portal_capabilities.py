@@ -32,6 +32,11 @@ OUTPUT_SWIFT = (
 )
 
 
+_PARENS_RE = re.compile(r"\s*\([^)]*\)")
+_PUNCT_RE = re.compile(r"[^0-9A-Za-z]+")
+_UPPER_BYTES = frozenset(range(ord("A"), ord("Z") + 1))
+
+
 def _developer_dir() -> Path:
     import os
 
@@ -67,9 +72,9 @@ def _portal_capabilities_json_path() -> Path:
 
 def _swift_case_name(display_name: str) -> str:
     # Strip parenthetical suffixes like "(development)".
-    name = re.sub(r"\s*\([^)]*\)", "", display_name)
+    name = _PARENS_RE.sub("", display_name)
     # Replace punctuation with spaces.
-    name = re.sub(r"[^0-9A-Za-z]+", " ", name)
+    name = _PUNCT_RE.sub(" ", name)
     words = [w for w in name.strip().split() if w]
     if not words:
         raise ValueError(display_name)
@@ -102,8 +107,11 @@ def _swift_case_name(display_name: str) -> str:
         return upper_camel
 
     # Convert UpperCamel to lowerCamel, handling leading acronym runs: URLSession -> urlSession.
+    # Case names are ASCII-only after `_PUNCT_RE`, so compare byte values instead of consulting
+    # the Unicode tables behind `str.isupper()`.
+    encoded = upper_camel.encode("ascii")
     run_end = 0
-    while run_end < len(upper_camel) and upper_camel[run_end].isupper():
+    while run_end < len(encoded) and encoded[run_end] in _UPPER_BYTES:
         run_end += 1
     if run_end <= 1:
         return upper_camel[0].lower() + upper_camel[1:]
@@ -112,7 +120,7 @@ def _swift_case_name(display_name: str) -> str:
 
 def main() -> int:
     json_path = _portal_capabilities_json_path()
-    payload = json.loads(json_path.read_text(encoding="utf-8"))
+    payload = json.loads(json_path.read_bytes())
     items = payload.get("data", [])
 
     entries: list[tuple[str, str, str]] = []
@@ -136,28 +144,28 @@ def main() -> int:
             )
         seen[case_name] = (cap_id, name)
 
-    lines: list[str] = []
-    lines.append("/// Portal capability identifiers derived from Xcode.")
-    lines.append("///")
-    lines.append("/// This file is generated from Xcode's bundled portal capability definitions.")
-    lines.append("/// Do not edit by hand; regenerate from the current Xcode installation.")
-    lines.append("///")
-    lines.append("/// Source: `DVTPortalCachedPortalCapabilities.json` inside the active Xcode installation.")
-    lines.append("extension Capability {")
-    lines.append("    /// Apple Developer portal “App ID capabilities” (a.k.a. managed capabilities).")
-    lines.append("    ///")
-    lines.append("    /// Use these when you need to enable an Apple service via entitlements but don't want")
-    lines.append("    /// to model a dedicated high-level API yet. Some capabilities require extra configuration")
-    lines.append("    /// (for example, selecting values or providing identifiers) and will be rejected by")
-    lines.append("    /// `EntitlementsFactory` unless a dedicated helper exists.")
-    lines.append("    public enum PortalCapability: String, CaseIterable, Hashable, Sendable {")
-    for case_name, cap_id, name in entries:
-        lines.append(f'        case {case_name} = "{cap_id}" // {name}')
-    lines.append("    }")
-    lines.append("}")
-    lines.append("")
+    header = """\
+/// Portal capability identifiers derived from Xcode.
+///
+/// This file is generated from Xcode's bundled portal capability definitions.
+/// Do not edit by hand; regenerate from the current Xcode installation.
+///
+/// Source: `DVTPortalCachedPortalCapabilities.json` inside the active Xcode installation.
+extension Capability {
+    /// Apple Developer portal “App ID capabilities” (a.k.a. managed capabilities).
+    ///
+    /// Use these when you need to enable an Apple service via entitlements but don't want
+    /// to model a dedicated high-level API yet. Some capabilities require extra configuration
+    /// (for example, selecting values or providing identifiers) and will be rejected by
+    /// `EntitlementsFactory` unless a dedicated helper exists.
+    public enum PortalCapability: String, CaseIterable, Hashable, Sendable {
+"""
+    body = "".join(
+        f'        case {case_name} = "{cap_id}" // {name}\n' for case_name, cap_id, name in entries
+    )
+    footer = "    }\n}\n"
 
-    OUTPUT_SWIFT.write_text("\n".join(lines), encoding="utf-8")
+    OUTPUT_SWIFT.write_text(header + body + footer, encoding="utf-8")
     print(f"✅ portal capabilities: wrote {OUTPUT_SWIFT.relative_to(REPO_ROOT)} ({len(entries)} cases)")
     return 0
 